@@ -1,4 +1,5 @@
 from pathlib import Path
+from zoneinfo import ZoneInfo
 
 from astral import LocationInfo
 
@@ -25,6 +26,7 @@ class Configuration:
         self.latitude = None
         self.longitude = None
         self.timezone = None
+        self.tzinfo = None
         self.pv_power_entity_id = None
         self.location = None
         self.power_consumption_entity_id = None
@@ -46,6 +48,8 @@ class Configuration:
         self.latitude = config.get(CONF_LATITUDE)
         self.longitude = config.get(CONF_LONGITUDE)
         self.timezone = config.get(CONF_TIMEZONE)
+        # Resolved once here rather than on every forecast update
+        self.tzinfo = ZoneInfo(self.timezone)
         self.pv_power_entity_id = config.get(CONF_PV_POWER_ENTITY)
         self.power_consumption_entity_id = config.get(CONF_POWER_CONSUMPTION_ENTITY)
         self.pv_batt_capacity_entity_id = config.get(CONF_BATT_CAPACITY_ENTITY)
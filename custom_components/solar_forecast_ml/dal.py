@@ -1,14 +1,19 @@
 import datetime
+from functools import lru_cache
 import logging
 from typing import TypedDict
 
+from astral import Observer
 from astral.sun import sun
+import aiohttp
+import numpy as np
 import pandas as pd
-import requests
 import sqlalchemy as sa
 
 from homeassistant.components.recorder import get_instance, history
 from homeassistant.components.recorder.models import state
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
 
 from .config import Configuration
 
@@ -22,62 +27,112 @@ METEO_PARAMS = [
     "direct_normal_irradiance",
 ]
 
+METEO_API_URL = "https://api.open-meteo.com/v1/forecast"
+METEO_PARAMS_QUERY = ",".join(METEO_PARAMS)
+
 
 class SensorDataRecord(TypedDict):
     time: pd.Timestamp
     power: float
 
 
+@lru_cache(maxsize=512)
+def _daytime_window(date: datetime.date, tzinfo, latitude, longitude):
+    """Return (dawn, dusk) extended by one hour for the given date and location."""
+    s = sun(Observer(latitude, longitude), date=date, tzinfo=tzinfo)
+    dawn = s["dawn"] - datetime.timedelta(hours=1)
+    dusk = s["dusk"] + datetime.timedelta(hours=1)
+    return dawn, dusk
+
+
 def is_daytime(dt: datetime):
     """Return True if dt is between sunrise and sunset."""
     cfg = Configuration.get_instance()
-    s = sun(cfg.location.observer, date=dt.date(), tzinfo=dt.tzinfo)
-    dawn = s["dawn"] - datetime.timedelta(hours=1)
-    dusk = s["dusk"] + datetime.timedelta(hours=1)
+    dawn, dusk = _daytime_window(dt.date(), dt.tzinfo, cfg.latitude, cfg.longitude)
     return dawn <= dt <= dusk
 
 
-def collect_meteo_data(from_date, to_date, skip_night=True):
+def daytime_mask(times: pd.Series) -> np.ndarray:
+    """Vectorized version of is_daytime for a Series of timezone-aware timestamps."""
+    cfg = Configuration.get_instance()
+    if times.empty:
+        return np.zeros(0, dtype=bool)
+
+    # Sun events are computed once per local date and broadcast back to the rows
+    local_days = times.dt.tz_localize(None).to_numpy().astype("datetime64[D]")
+    days, day_index = np.unique(local_days, return_inverse=True)
+    windows = [
+        _daytime_window(date, times.dt.tz, cfg.latitude, cfg.longitude)
+        for date in days.tolist()
+    ]
+    dawn = pd.to_datetime([dawn for dawn, _ in windows], utc=True)
+    dusk = pd.to_datetime([dusk for _, dusk in windows], utc=True)
+
+    utc = times.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy()
+    dawn = dawn.tz_localize(None).to_numpy()[day_index]
+    dusk = dusk.tz_localize(None).to_numpy()[day_index]
+    return (dawn <= utc) & (utc <= dusk)
+
+
+async def _fetch_meteo_json(hass, params: dict[str, str]) -> dict:
+    """Fetch Open-Meteo JSON for the given query parameters."""
+    session = async_get_clientsession(hass)
+    async with session.get(
+        METEO_API_URL, params=params, timeout=aiohttp.ClientTimeout(total=5)
+    ) as response:
+        response.raise_for_status()
+        return await response.json(loads=json_loads)
+
+
+async def collect_meteo_data(hass, from_date, to_date, skip_night=True):
     """
     Collect historical meteo data from the Open-Meteo API between from_date and to_date.
-    The dates must be datetime.date objects.
-    Returns a list of dictionaries (one per hour, daytime only).
+    The dates may be datetime.date or datetime objects, only the date part is used.
+    Returns a DataFrame with one row per 15 minutes, night rows are dropped
+    when skip_night is True.
     """
     cfg = Configuration.get_instance()
-    url = (
-        f"https://api.open-meteo.com/v1/forecast?latitude={cfg.latitude}&longitude={cfg.longitude}"
-        f"&minutely_15={','.join(METEO_PARAMS)}"
-        f"&start_date={from_date:%Y-%m-%d}&end_date={to_date:%Y-%m-%d}"
-    )
-    response = requests.get(url, timeout=5)
-    response.raise_for_status()
-    data = response.json()
-    minutely_15 = data.get("minutely_15", {})
-    records = []
-    times = minutely_15.get("time", [])
-    for i, time in enumerate(times):
-        try:
-            dt = pd.to_datetime(time, utc=True).tz_convert(cfg.timezone)
-
-            # Ensure dt is timezone-aware.
+    params = {
+        "latitude": str(cfg.latitude),
+        "longitude": str(cfg.longitude),
+        "minutely_15": METEO_PARAMS_QUERY,
+        "start_date": f"{from_date:%Y-%m-%d}",
+        "end_date": f"{to_date:%Y-%m-%d}",
+    }
+    data = await _fetch_meteo_json(hass, params)
+    return await hass.async_add_executor_job(process_meteo_data_sync, data, skip_night)
+
+
+def process_meteo_data_sync(data: dict, skip_night: bool) -> pd.DataFrame:
+    """Process an Open-Meteo response synchronously.
+
+    Returns a DataFrame with a tz-aware "time" column and one column per
+    METEO_PARAMS, empty if the response is unusable.
+    """
+    cfg = Configuration.get_instance()
+    df = pd.DataFrame(data.get("minutely_15", {}))
 
-            # if dt.tzinfo is None:
-            #     dt = dt.replace(tzinfo=ZoneInfo("Europe/Prague"))
+    missing = [col for col in ["time", *METEO_PARAMS] if col not in df.columns]
+    if missing:
+        _LOGGER.error("Meteo data is missing columns: %s", missing)
+        return pd.DataFrame(columns=["time", *METEO_PARAMS])
 
-            # Only include daytime records
-            if not is_daytime(dt) and skip_night:
-                continue
+    # Open-Meteo returns naive ISO 8601 times in UTC (GMT is the default timezone)
+    df["time"] = pd.to_datetime(df["time"], format="ISO8601", utc=True).dt.tz_convert(
+        cfg.timezone
+    )
+    df[METEO_PARAMS] = df[METEO_PARAMS].apply(pd.to_numeric, errors="coerce")
 
-            record = {"time": dt}
+    # Only include daytime records, sun events are not needed otherwise
+    if skip_night:
+        df = df[daytime_mask(df["time"])]
 
-            # Add all meteo parameters to the record
-            for param in METEO_PARAMS:
-                record[param] = float(minutely_15[param][i])
+    invalid = df[METEO_PARAMS].isna().any(axis=1)
+    if invalid.any():
+        _LOGGER.error("Skipping %d meteo records with missing values", invalid.sum())
+        df = df[~invalid]
 
-            records.append(record)
-        except Exception as e:
-            _LOGGER.error(f"Error processing meteo record index {i}: {e}")
-    return records
+    return df[["time", *METEO_PARAMS]].reset_index(drop=True)
 
 
 def get_aggregated_states(
@@ -180,9 +235,29 @@ async def collect_pv_power_historical_data(
     )
 
 
-def collect_pv_power_csv_data(csv_file_name: str) -> list[SensorDataRecord]:
-    return convert_pv_power_data_to_dict(
-        pd.read_csv(csv_file_name), "last_updated_ts", "state"
+def collect_pv_power_csv_data(
+    csv_file_name: str, interval_minutes: int = 15
+) -> list[SensorDataRecord]:
+    """
+    Load PV power states exported to CSV (last_updated_ts, state columns),
+    aggregated into intervals of 'interval_minutes' minutes like the recorder query.
+    """
+    cfg = Configuration.get_instance()
+    df = pd.read_csv(
+        csv_file_name,
+        usecols=["last_updated_ts", "state"],
+        dtype={"last_updated_ts": "float64", "state": "string"},
+    )
+    # Non numeric states (unavailable, unknown) become NaN and are dropped
+    df["state"] = pd.to_numeric(df["state"], errors="coerce")
+    df = df.dropna(subset=["state"])
+
+    interval_seconds = interval_minutes * 60
+    df["time_interval"] = (df["last_updated_ts"] // interval_seconds) * interval_seconds
+    aggregated = df.groupby("time_interval", as_index=False, sort=False)["state"].mean()
+
+    return convert_pv_power_data_to_dict_sync(
+        aggregated, "time_interval", "state", cfg.timezone
     )
 
 
@@ -190,13 +265,16 @@ def convert_pv_power_data_to_dict_sync(
     sensor_data: pd.DataFrame, time_column: str, power_column: str, timezone: str
 ) -> list[SensorDataRecord]:
     """Synchronous version of data conversion."""
-    sensor_data["time"] = pd.to_datetime(
-        sensor_data[time_column], unit="s", utc=True
-    ).dt.tz_convert(timezone)
-    sensor_data["power"] = sensor_data[power_column].astype(float)
-    sensor_data = sensor_data[["time", "power"]]
-    sensor_data = sensor_data[sensor_data["power"] > 0]
-    return sensor_data.to_dict(orient="records")
+    if sensor_data.empty:
+        return []
+
+    # Filter on the raw columns first so only kept rows are converted
+    power = sensor_data[power_column].to_numpy(dtype=float)
+    mask = power > 0
+    times = pd.to_datetime(
+        sensor_data[time_column].to_numpy()[mask], unit="s", utc=True
+    ).tz_convert(timezone)
+    return pd.DataFrame({"time": times, "power": power[mask]}).to_dict(orient="records")
 
 
 async def convert_pv_power_data_to_dict(
@@ -216,20 +294,20 @@ async def convert_pv_power_data_to_dict(
     )
 
 
-def merge_meteo_and_pv_power_data_sync(meteo_records, pv_power_records):
+def merge_meteo_and_pv_power_data_sync(meteo_df, pv_power_records):
     """Synchronous version of merge operation."""
-    df_meteo = pd.DataFrame(meteo_records)
-    df_sensor = pd.DataFrame(pv_power_records)
-    df = pd.merge(df_meteo, df_sensor, on="time", how="inner")
-    df = df.sort_values("time")
+    df_meteo = meteo_df.set_index("time")
+    df_sensor = pd.DataFrame(pv_power_records).set_index("time")
+    # Both sides are sorted and unique by time, so the join aligns monotonic indexes
+    df = df_meteo.join(df_sensor, how="inner").reset_index()
     return df
 
 
-async def merge_meteo_and_pv_power_data(hass, meteo_records, pv_power_records):
+async def merge_meteo_and_pv_power_data(hass, meteo_df, pv_power_records):
     """Async wrapper for merge operation."""
     return await hass.async_add_executor_job(
         merge_meteo_and_pv_power_data_sync,
-        meteo_records,
+        meteo_df,
         pv_power_records,
     )
 
@@ -1,12 +1,11 @@
 import datetime
 import logging
-from zoneinfo import ZoneInfo
 
-import pandas as pd
+import numpy as np
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.event import run_callback_threadsafe
-from .forecast_data import ForecastData
+from .forecast_data import ForecastData, interval_mean, lookup_at, to_datetime64
 from .config import Configuration
 
 _LOGGER = logging.getLogger(__name__)
@@ -28,11 +27,15 @@ def _calculate_battery_energy(
 
 def forecast_battery_capacity(
     hass: HomeAssistant,
+    now: datetime.datetime,
     days: int,
     solar_forecast_data: ForecastData,
     consumption_forecast_data: ForecastData,
 ):
-    """Forecast the battery capacity (in %) for the next 'days' days."""
+    """Forecast the battery capacity (in %) for the next 'days' days.
+
+    The forecast starts with the current capacity at `now`.
+    """
     _LOGGER.info("Forecasting battery capacity for the next %d days", days)
     config = Configuration.get_instance()
 
@@ -48,93 +51,53 @@ def forecast_battery_capacity(
         float(hass.states.get(config.pv_batt_max_soc).state) / 100.0
     )
 
-    # Get solar forecast and convert to pandas DataFrame
-    solar_forecast = pd.DataFrame(solar_forecast_data.forecast)
-    solar_forecast["time"] = pd.to_datetime(solar_forecast["time"])
-    solar_forecast["hour"] = solar_forecast["time"].dt.floor(
-        "h"
-    )  # Changed from "H" to "h"
-
-    # Aggregate solar forecast by hour
-    solar_hourly = solar_forecast.groupby("hour")["power"].mean().to_dict()
-
-    # Get consumption forecast and convert to pandas DataFrame
-    cons_forecast = pd.DataFrame(consumption_forecast_data.forecast)
-    cons_forecast["time"] = pd.to_datetime(cons_forecast["time"])
-    cons_forecast.set_index("time", inplace=True)
-
     # Setup simulation timeframe
-    tz = ZoneInfo(config.timezone)
-    now = datetime.datetime.now(tz)
     current_hour = now.replace(minute=0, second=0, microsecond=0)
     start_sim = (
         current_hour
         if now == current_hour
         else current_hour + datetime.timedelta(hours=1)
     )
-    end_sim = start_sim + datetime.timedelta(hours=days * 24)
-
-    # Initialize forecast results with current state
-    forecast_results = [
-        {
-            "time": now.isoformat(),
-            "min": current_capacity,
-            "med": current_capacity,
-            "max": current_capacity,
-        }
-    ]
-
-    # Track energy levels for each scenario
-    current_energies = {
-        "min": current_energy,
-        "med": current_energy,
-        "max": current_energy,
-    }
+    sim_times = to_datetime64([start_sim]) + np.arange(days * 24).astype(
+        "timedelta64[h]"
+    )
 
-    # Simulation loop
-    sim_time = start_sim
-    while sim_time < end_sim:
-        solar_power = solar_hourly.get(sim_time, 0.0)
-
-        try:
-            cons = cons_forecast.loc[sim_time]
-            consumption = {
-                "min": float(cons["min"]),
-                "med": float(cons["med"]),
-                "max": float(cons["max"]),
-            }
-        except KeyError:
-            consumption = {"min": 0.0, "med": 0.0, "max": 0.0}
-
-        # Calculate net energy for each scenario
-        net_energies = {
-            "min": solar_power - consumption["max"],
-            "med": solar_power - consumption["med"],
-            "max": solar_power - consumption["min"],
-        }
-
-        # Update battery energy for each scenario
-        new_energies = {
-            scenario: _calculate_battery_energy(
-                net_energies[scenario],
-                current_energies[scenario],
-                config,
-                batt_max_energy,
-                batt_min_energy,
-            )
-            for scenario in ["min", "med", "max"]
-        }
+    # Align solar and consumption forecasts to the simulation hours
+    solar_power = interval_mean(
+        solar_forecast_data.times, solar_forecast_data.forecast["power"], sim_times
+    )
+    consumption = {
+        scenario: lookup_at(
+            consumption_forecast_data.times,
+            consumption_forecast_data.forecast[scenario],
+            sim_times,
+        )
+        for scenario in ["min", "med", "max"]
+    }
 
-        # Convert to capacity percentage
-        capacities = {
-            scenario: (energy / max_energy * 100.0)
-            for scenario, energy in new_energies.items()
-        }
+    # Calculate net energy for each scenario
+    net_energies = {
+        "min": solar_power - consumption["max"],
+        "med": solar_power - consumption["med"],
+        "max": solar_power - consumption["min"],
+    }
 
-        forecast_results.append({"time": sim_time.isoformat(), **capacities})
+    # Simulate battery energy for each scenario, starting with current state
+    capacities = {}
+    for scenario, net_energy in net_energies.items():
+        energies = np.empty(len(sim_times) + 1)
+        energies[0] = current_energy
+        for i, net in enumerate(net_energy.tolist()):
+            energies[i + 1] = _calculate_battery_energy(
+                net, energies[i], config, batt_max_energy, batt_min_energy
+            )
+        capacities[scenario] = energies / max_energy * 100.0
+        capacities[scenario][0] = current_capacity
 
-        current_energies = new_energies
-        sim_time += datetime.timedelta(hours=1)
+    forecast_results = {
+        "time": np.concatenate([to_datetime64([now]), sim_times]),
+        **capacities,
+    }
 
     # Update the sensor. Assume your sensor is stored in hass.data under the key SENSOR_PV_BATTERY_FORECAST.
     # run_callback_threadsafe(
@@ -144,6 +107,6 @@ def forecast_battery_capacity(
     # )  # Pass the JSON forecast data.
     _LOGGER.info(
         "Battery capacity forecast completed successfully with %d records",
-        len(forecast_results),
+        len(forecast_results["time"]),
     )
     return ForecastData(forecast_results, now, "min", "med", "max")
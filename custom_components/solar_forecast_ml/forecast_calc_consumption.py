@@ -1,17 +1,20 @@
 from datetime import datetime, timedelta
 import logging
-from zoneinfo import ZoneInfo
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.ensemble import GradientBoostingRegressor
-from sklearn.preprocessing import StandardScaler
 
 from homeassistant.core import HomeAssistant
 
 from . import dal
 from .config import Configuration
-from .forecast_data import ForecastData
+from .forecast_data import ForecastData, to_datetime64
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import HistGradientBoostingRegressor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +25,11 @@ QUANTILE_MODELS = {
     "max": {"alpha": 0.95, "suffix": "_high.pkl"},
 }
 FEATURE_COLS = ["hour", "day_of_week"]
+# Models trained before the scaler was dropped expect scaled features
+LEGACY_SCALER_FILE = f"{CONSUMPTION_MODEL_PREFIX}_scaler.pkl"
+
+# Loaded models keyed by file path, valid while its mtime is unchanged
+_models_cache: dict[Path, tuple[int, "HistGradientBoostingRegressor"]] = {}
 
 
 def when_model_was_trained() -> datetime:
@@ -37,14 +45,14 @@ def when_model_was_trained() -> datetime:
             .st_mtime
             for params in QUANTILE_MODELS.values()
         ),
-        tz=ZoneInfo(cfg.timezone),
+        tz=cfg.tzinfo,
     )
 
 
 def is_model_trained() -> bool:
     """Check if the consumption model is trained."""
     cfg = Configuration.get_instance()
-    return all(
+    return not cfg.storage_path(LEGACY_SCALER_FILE).exists() and all(
         cfg.storage_path(f"{CONSUMPTION_MODEL_PREFIX}{params['suffix']}").exists()
         for params in QUANTILE_MODELS.values()
     )
@@ -52,26 +60,40 @@ def is_model_trained() -> bool:
 
 def train_consumption_model(df: pd.DataFrame):
     """Train quantile regression models for energy consumption prediction."""
+    # Imported lazily, sklearn is only needed when (re)training the models
+    from sklearn.ensemble import HistGradientBoostingRegressor
+
     cfg = Configuration.get_instance()
 
     if df.empty or len(df) < 10:
         raise ValueError("Not enough data to train consumption model.")
 
-    X = df[FEATURE_COLS].values
-    y = df["power"].values
-
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    # Train models for each quantile
-    models = {
-        name: GradientBoostingRegressor(
-            loss="quantile", alpha=params["alpha"], n_estimators=100, max_depth=3
-        ).fit(X_scaled, y)
-        for name, params in QUANTILE_MODELS.items()
-    }
+    # Trees are invariant to feature scaling, hour and day of week are used as is.
+    # Converted once to the contiguous float64 layout the boosters validate to, so
+    # the threads share these buffers instead of each fit making its own copy.
+    X = np.ascontiguousarray(df[FEATURE_COLS].to_numpy(dtype=np.float64))
+    y = np.ascontiguousarray(df["power"].to_numpy(dtype=np.float64))
+    X.setflags(write=False)
+    y.setflags(write=False)
+
+    # Train models for each quantile, the fits are independent so run them
+    # concurrently (threads, the tree builders release the GIL)
+    fitted = joblib.Parallel(n_jobs=len(QUANTILE_MODELS), prefer="threads")(
+        joblib.delayed(
+            HistGradientBoostingRegressor(
+                loss="quantile",
+                quantile=params["alpha"],
+                max_iter=100,
+                max_depth=3,
+                early_stopping=False,
+                categorical_features=[0, 1],
+            ).fit
+        )(X, y)
+        for params in QUANTILE_MODELS.values()
+    )
+    models = dict(zip(QUANTILE_MODELS, fitted))
 
-    # Save models and scaler
+    # Save models
     for name, model in models.items():
         joblib.dump(
             model,
@@ -79,46 +101,45 @@ def train_consumption_model(df: pd.DataFrame):
                 f"{CONSUMPTION_MODEL_PREFIX}{QUANTILE_MODELS[name]['suffix']}"
             ),
         )
-    joblib.dump(scaler, cfg.storage_path(f"{CONSUMPTION_MODEL_PREFIX}_scaler.pkl"))
+    cfg.storage_path(LEGACY_SCALER_FILE).unlink(missing_ok=True)
 
 
-def load_consumption_models() -> (
-    tuple[tuple[GradientBoostingRegressor, ...], StandardScaler]
-):
-    """Load trained models and scaler from disk."""
+def load_consumption_models() -> tuple["HistGradientBoostingRegressor", ...]:
+    """Load trained models from disk, reusing them until they are retrained."""
     cfg = Configuration.get_instance()
-
-    models = {
-        name: joblib.load(
-            cfg.storage_path(f"{CONSUMPTION_MODEL_PREFIX}{params['suffix']}")
+    if cfg.storage_path(LEGACY_SCALER_FILE).exists():
+        raise ValueError(
+            "Consumption models expect scaled features, retraining is required"
         )
-        for name, params in QUANTILE_MODELS.items()
-    }
 
-    scaler = joblib.load(cfg.storage_path(f"{CONSUMPTION_MODEL_PREFIX}_scaler.pkl"))
-    return tuple(models.values()), scaler
+    models = []
+    for params in QUANTILE_MODELS.values():
+        path = cfg.storage_path(f"{CONSUMPTION_MODEL_PREFIX}{params['suffix']}")
+        mtime = path.stat().st_mtime_ns
+        cached = _models_cache.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = _models_cache[path] = (mtime, joblib.load(path))
+        models.append(cached[1])
+    return tuple(models)
 
 
 def predict_consumption(
-    models: tuple[GradientBoostingRegressor, ...],
-    scaler: StandardScaler,
-    input_data: list[dict[str, int]],
-) -> list[dict[str, int | float]]:
-    """Predict energy consumption using quantile regression models."""
-    df = pd.DataFrame(input_data)
-
-    if not all(col in df.columns for col in FEATURE_COLS):
+    models: tuple["HistGradientBoostingRegressor", ...],
+    X: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Predict energy consumption using quantile regression models.
+
+    X holds one row per hour with the FEATURE_COLS columns. Returns the
+    predictions column-wise, one array per quantile.
+    """
+    if X.ndim != 2 or X.shape[1] != len(FEATURE_COLS):
         raise ValueError(f"Input data must contain {FEATURE_COLS}")
 
-    X = df[FEATURE_COLS].values
-    X_scaled = scaler.transform(X)
-
     # Make predictions for each quantile
-    predictions = df[["hour"]].copy()
-    for model, name in zip(models, QUANTILE_MODELS.keys()):
-        predictions[name] = model.predict(X_scaled)
-
-    return predictions.to_dict("records")
+    return {
+        name: model.predict(X).astype(float)
+        for model, name in zip(models, QUANTILE_MODELS.keys())
+    }
 
 
 async def collect_and_train(
@@ -139,45 +160,39 @@ async def collect_and_train(
 
 async def generate_predictions(
     hass: HomeAssistant, from_date: datetime, to_date: datetime
-) -> list[dict[str, str | float]]:
+) -> ForecastData:
     """Generate consumption predictions for the specified date range."""
     _LOGGER.info("Generating consumption predictions from %s to %s", from_date, to_date)
     cfg = Configuration.get_instance()
 
-    tz = ZoneInfo(cfg.timezone)
+    tz = cfg.tzinfo
 
-    # Generate input data for each hour in the date range
-    input_data = []
+    # Local midnight of each day in the date range
+    days = []
     current_date = from_date
     while current_date <= to_date:
-        dt = datetime.combine(current_date, datetime.min.time(), tzinfo=tz)
-        input_data.extend(
-            [{"hour": hour, "day_of_week": dt.weekday()} for hour in range(24)]
-        )
+        days.append(datetime.combine(current_date, datetime.min.time(), tzinfo=tz))
         current_date += timedelta(days=1)
 
-    # Load models and make predictions
-    models, scaler = await hass.async_add_executor_job(load_consumption_models)
-    predictions = await hass.async_add_executor_job(
-        predict_consumption, models, scaler, input_data
+    # One row per hour of each day, built directly as the model input matrix
+    timestamps = [day + timedelta(hours=hour) for day in days for hour in range(24)]
+    X = np.column_stack(
+        [
+            np.tile(np.arange(24, dtype=np.float64), len(days)),
+            np.repeat(np.array([day.weekday() for day in days], np.float64), 24),
+        ]
     )
 
-    # Create timestamps for predictions
-    timestamps = []
-    current_date = from_date
-    while current_date <= to_date:
-        dt = datetime.combine(current_date, datetime.min.time(), tzinfo=tz)
-        timestamps.extend(
-            [(dt + timedelta(hours=hour)).isoformat() for hour in range(24)]
-        )
-        current_date += timedelta(days=1)
+    # Load models and make predictions
+    models = await hass.async_add_executor_job(load_consumption_models)
+    predictions = await hass.async_add_executor_job(predict_consumption, models, X)
 
     # Combine timestamps with predictions
-    predictions = [{"time": ts, **pred} for ts, pred in zip(timestamps, predictions)]
+    forecast = {"time": to_datetime64(timestamps), **predictions}
     # hass.data[const.DOMAIN][const.SENSOR_POWER_CONSUMPTION].update_forecast(predictions)
     _LOGGER.info(
         "Consumption predictions completed successfully with %d records",
-        len(predictions),
+        len(timestamps),
     )
 
-    return ForecastData(predictions, datetime.now(tz), "min", "med", "max")
+    return ForecastData(forecast, datetime.now(tz), "min", "med", "max")
@@ -2,35 +2,43 @@
 
 import datetime
 import logging
-from zoneinfo import ZoneInfo
 
-import pandas as pd
+import numpy as np
 
 from homeassistant.core import HomeAssistant
 
 from .config import Configuration
-from .forecast_data import ForecastData
+from .forecast_data import ForecastData, interval_mean, lookup_at, to_datetime64
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# Grid scenarios paired with the battery scenario they are simulated against
+SCENARIOS = ["min", "med", "max"]
+BATTERY_SCENARIOS = ["max", "med", "min"]
+
+
 def _calculate_grid_exchange(
-    solar_power: float,
-    consumption: float,
-    battery_soc: float,
+    solar_power: np.ndarray,
+    consumption: np.ndarray,
+    battery_soc: np.ndarray,
     batt_min_threshold: float,
     batt_max_threshold: float,
-) -> float:
-    """Calculate grid exchange based on power flows and battery state."""
-    if solar_power > consumption and battery_soc >= batt_max_threshold:
-        return solar_power - consumption
-    elif solar_power < consumption and battery_soc <= batt_min_threshold:
-        return -(consumption - solar_power)
-    return 0.0
+) -> np.ndarray:
+    """Calculate grid exchange based on power flows and battery state.
+
+    `solar_power` has shape (N,), `consumption` and `battery_soc` have shape
+    (N, scenarios) and the result has the same shape as `consumption`.
+    """
+    surplus = solar_power[:, np.newaxis] - consumption
+    exchange = (surplus > 0) & (battery_soc >= batt_max_threshold)
+    exchange |= (surplus < 0) & (battery_soc <= batt_min_threshold)
+    return np.where(exchange, surplus, 0.0)
 
 
 def forecast_grid(
     hass: HomeAssistant,
+    now: datetime.datetime,
     days: int,
     solar_forecast_data: ForecastData,
     consumption_forecast_data: ForecastData,
@@ -40,32 +48,6 @@ def forecast_grid(
     _LOGGER.info("Forecasting grid export/import for the next %d days", days)
     config = Configuration.get_instance()
 
-    # Get forecasts and convert to DataFrames
-    try:
-        solar_df = pd.DataFrame(solar_forecast_data.forecast)
-        solar_df["time"] = pd.to_datetime(solar_df["time"], format="ISO8601")
-        solar_df["hour"] = solar_df["time"].dt.floor("h")
-        solar_hourly = solar_df.groupby("hour")["power"].mean()
-    except Exception as e:
-        _LOGGER.error("Error processing solar forecast: %s", e)
-        return
-
-    try:
-        cons_df = pd.DataFrame(consumption_forecast_data.forecast)
-        cons_df["time"] = pd.to_datetime(cons_df["time"], format="ISO8601")
-        cons_df.set_index("time", inplace=True)
-    except Exception as e:
-        _LOGGER.error("Error processing consumption forecast: %s", e)
-        return
-
-    try:
-        batt_df = pd.DataFrame(battery_forecast_data.forecast)
-        batt_df["time"] = pd.to_datetime(batt_df["time"], format="ISO8601")
-        batt_df.set_index("time", inplace=True)
-    except Exception as e:
-        _LOGGER.error("Error processing battery forecast: %s", e)
-        return
-
     # Get battery thresholds
     try:
         batt_thresholds = {
@@ -77,60 +59,72 @@ def forecast_grid(
         batt_thresholds = {"min": 10.0, "max": 90.0}
 
     # Setup simulation timeframe
-    tz = ZoneInfo(config.timezone)
-    now = datetime.datetime.now(tz)
     current_hour = now.replace(minute=0, second=0, microsecond=0)
     start_sim = (
         current_hour
         # if now == current_hour
         # else current_hour + datetime.timedelta(hours=1)
     )
-    end_sim = start_sim + datetime.timedelta(hours=days * 24)
-
-    grid_forecast = []
-
-    # Simulation loop
-    sim_time = start_sim
-    while sim_time < end_sim:
-        solar_power = solar_hourly.get(sim_time, 0.0)
-
-        try:
-            cons = cons_df.loc[sim_time]
-            batt = batt_df.loc[sim_time]
-
-            # Calculate grid exchange for each scenario
-            grid_values = {
-                "min": _calculate_grid_exchange(
-                    solar_power,
-                    cons["min"],
-                    float(batt["max"]),
-                    batt_thresholds["min"],
-                    batt_thresholds["max"],
-                ),
-                "med": _calculate_grid_exchange(
-                    solar_power,
-                    cons["med"],
-                    float(batt["med"]),
-                    batt_thresholds["min"],
-                    batt_thresholds["max"],
-                ),
-                "max": _calculate_grid_exchange(
-                    solar_power,
-                    cons["max"],
-                    float(batt["min"]),
-                    batt_thresholds["min"],
-                    batt_thresholds["max"],
-                ),
-            }
-
-            grid_forecast.append({"time": sim_time.isoformat(), **grid_values})
-
-        except KeyError:
-            grid_forecast.append(
-                {"time": sim_time.isoformat(), "min": 0.0, "med": 0.0, "max": 0.0}
-            )
-
-        sim_time += datetime.timedelta(hours=1)
+
+    sim_times = to_datetime64([start_sim]) + np.arange(days * 24).astype(
+        "timedelta64[h]"
+    )
+
+    # Get forecasts as arrays aligned to the simulation hours
+    try:
+        solar_power = interval_mean(
+            solar_forecast_data.times, solar_forecast_data.forecast["power"], sim_times
+        )
+    except Exception as e:
+        _LOGGER.error("Error processing solar forecast: %s", e)
+        return
+
+    try:
+        cons = np.column_stack(
+            [
+                lookup_at(
+                    consumption_forecast_data.times,
+                    consumption_forecast_data.forecast[scenario],
+                    sim_times,
+                    np.nan,
+                )
+                for scenario in SCENARIOS
+            ]
+        )
+    except Exception as e:
+        _LOGGER.error("Error processing consumption forecast: %s", e)
+        return
+
+    try:
+        batt = np.column_stack(
+            [
+                lookup_at(
+                    battery_forecast_data.times,
+                    battery_forecast_data.forecast[scenario],
+                    sim_times,
+                    np.nan,
+                )
+                for scenario in BATTERY_SCENARIOS
+            ]
+        )
+    except Exception as e:
+        _LOGGER.error("Error processing battery forecast: %s", e)
+        return
+
+    # Calculate grid exchange for all scenarios at once
+    grid_values = _calculate_grid_exchange(
+        solar_power, cons, batt, batt_thresholds["min"], batt_thresholds["max"]
+    )
+
+    # Hours missing either forecast have no grid exchange
+    missing = np.isnan(cons).any(axis=1) | np.isnan(batt).any(axis=1)
+    grid_values[missing] = 0.0
+
+    grid_forecast = {
+        "time": sim_times,
+        **{scenario: grid_values[:, i] for i, scenario in enumerate(SCENARIOS)},
+    }
+
     # run_callback_threadsafe(
     #    hass.loop,
     #    hass.data[const.DOMAIN][const.SENSOR_GRID_FORECAST].update_forecast,
@@ -138,7 +132,7 @@ def forecast_grid(
     # )
     _LOGGER.info(
         "Grid forecast completed successfully with %d records",
-        len(grid_forecast),
+        len(grid_forecast["time"]),
     )
 
     return ForecastData(grid_forecast, now, "min", "med", "max")
@@ -1,11 +1,11 @@
-from datetime import datetime
+import asyncio
+from datetime import UTC, datetime
 import logging
-from zoneinfo import ZoneInfo
+from pathlib import Path
 
 import joblib
+import numpy as np
 import pandas as pd
-from sklearn.neural_network import MLPRegressor
-from sklearn.preprocessing import StandardScaler
 
 from homeassistant.core import HomeAssistant
 
@@ -20,6 +20,9 @@ _LOGGER = logging.getLogger(__name__)
 # Update feature_cols to use the same parameter names
 feature_cols = METEO_PARAMS  # + ["sun_altitude", "sun_azimuth"]
 
+# Loaded weights keyed by archive path, valid while its mtime is unchanged
+_weights_cache: dict[Path, tuple[int, list[np.ndarray], list[np.ndarray]]] = {}
+
 
 def when_model_was_trained() -> datetime:
     """Return the timestamp when the solar power model was trained."""
@@ -27,7 +30,7 @@ def when_model_was_trained() -> datetime:
     model_path = cfg.storage_path("solar_power_model.pkl")
     if not model_path.exists():
         return None
-    return datetime.fromtimestamp(model_path.stat().st_mtime, tz=ZoneInfo(cfg.timezone))
+    return datetime.fromtimestamp(model_path.stat().st_mtime, tz=cfg.tzinfo)
 
 
 def is_model_trained() -> bool:
@@ -51,24 +54,21 @@ async def collect_and_train(
         raise ValueError("No sensor data collected")
 
     # Collect meteo data
-    meteo_records = await hass.async_add_executor_job(
-        dal.collect_meteo_data, start_date, end_date, False
-    )
-    if not meteo_records:
+    meteo_df = await dal.collect_meteo_data(hass, start_date, end_date, False)
+    if meteo_df.empty:
         raise ValueError("No meteo data collected")
 
     # Merge data - note the added hass parameter
-    data_df = await dal.merge_meteo_and_pv_power_data(
-        hass, meteo_records, sensor_records
-    )
+    data_df = await dal.merge_meteo_and_pv_power_data(hass, meteo_df, sensor_records)
     if len(data_df) < 10:
         raise ValueError("Not enough merged data for training")
 
-    # Save training data
-    csv_filename = cfg.storage_path("solar_training_data.csv")
-    await hass.async_add_executor_job(
-        lambda: data_df.to_csv(path_or_buf=csv_filename, index=False)
-    )
+    # Save training data for inspection, it is not read back by the integration
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        csv_filename = cfg.storage_path("solar_training_data.csv")
+        await hass.async_add_executor_job(
+            lambda: data_df.to_csv(path_or_buf=csv_filename, index=False)
+        )
 
     # Train model
     await hass.async_add_executor_job(
@@ -76,6 +76,7 @@ async def collect_and_train(
         data_df,
         cfg.storage_path("solar_power_model.pkl"),
         cfg.storage_path("solar_scaler.pkl"),
+        cfg.storage_path("solar_power_model.npz"),
     )
     _LOGGER.info("Solar power model training completed")
 
@@ -87,54 +88,57 @@ async def collect_and_predict(
     _LOGGER.info("Forecasting power consumption from %s to %s", from_date, to_date)
     cfg = Configuration.get_instance()
 
-    # Get forecast data
-    forecast_data = await hass.async_add_executor_job(
-        dal.collect_meteo_data, from_date, to_date, True
+    # Fetch the forecast and load the model concurrently, they are independent
+    forecast_data, (weights, biases) = await asyncio.gather(
+        dal.collect_meteo_data(hass, from_date, to_date, True),
+        hass.async_add_executor_job(
+            load_model_weights,
+            cfg.storage_path("solar_power_model.npz"),
+            cfg.storage_path("solar_power_model.pkl"),
+            cfg.storage_path("solar_scaler.pkl"),
+        ),
     )
-    if not forecast_data:
+    if forecast_data.empty:
         raise ValueError("No forecast data collected")
 
-    # Load model and make predictions
-    model, scaler = await hass.async_add_executor_job(
-        load_model_and_scaler,
-        cfg.storage_path("solar_power_model.pkl"),
-        cfg.storage_path("solar_scaler.pkl"),
-    )
-
-    predictions = predict_power(model, scaler, forecast_data)
+    predictions = predict_power(weights, biases, forecast_data)
 
     # Format results
-    result = [
-        {
-            "time": rec["time"].isoformat()
-            if hasattr(rec["time"], "isoformat")
-            else str(rec["time"]),
-            "power": pred,
-        }
-        for rec, pred in zip(forecast_data, predictions)
-    ]
+    result = {
+        "time": forecast_data["time"]
+        .dt.tz_convert(UTC)
+        .dt.tz_localize(None)
+        .to_numpy(dtype="datetime64[ns]"),
+        "power": np.asarray(predictions, dtype=float),
+    }
 
     # hass.data[const.DOMAIN][const.SENSOR_PV_POWER_FORECAST].update_forecast(result)
     _LOGGER.info(
-        "Power consumption forecast completed successfully with %d records", len(result)
+        "Power consumption forecast completed successfully with %d records",
+        len(result["time"]),
     )
-    now = datetime.now(ZoneInfo(cfg.timezone))
+    now = datetime.now(cfg.tzinfo)
     return ForecastData(result, now, None, "power", None)
 
 
-def train_model(data_df, model_path, scaler_path):
+def train_model(data_df, model_path, scaler_path, weights_path):
     """Train an MLP neural network regressor using the merged data.
     The data_df must include all meteo features and a 'power' column.
-    Saves the trained model and scaler to the provided paths.
+    Saves the trained model and scaler to the provided paths, and the weights
+    used for inference to weights_path.
     """
+    # Imported lazily, sklearn is only needed when (re)training the model
+    from sklearn.neural_network import MLPRegressor
+    from sklearn.preprocessing import StandardScaler
 
     _LOGGER.info("Starting training with %d records", len(data_df))
 
     for col in [*feature_cols, "power"]:
         if col not in data_df.columns:
             raise ValueError(f"Column {col} not found in data.")
-    X = data_df[feature_cols].values
-    y = data_df["power"].values
+    # float32 halves memory bandwidth, sklearn keeps the dtype through the pipeline
+    X = np.ascontiguousarray(data_df[feature_cols].to_numpy(dtype=np.float32))
+    y = data_df["power"].to_numpy(dtype=np.float32)
 
     # Scale the features
     scaler = StandardScaler()
@@ -162,6 +166,7 @@ def train_model(data_df, model_path, scaler_path):
     # Save the model and scaler
     joblib.dump(model, model_path)
     joblib.dump(scaler, scaler_path)
+    save_model_weights(model, scaler, weights_path)
     return model, scaler
 
 
@@ -172,17 +177,81 @@ def load_model_and_scaler(model_path, scaler_path):
     return model, scaler
 
 
-def predict_power(model, scaler, forecast_data):
+def fuse_model_and_scaler(model, scaler):
+    """Return the MLP layers as float32 (weights, biases) with the scaler
+    folded into the first layer.
     """
-    Given forecast_data (a list of dictionaries with meteo features), predict panel power.
-    Returns a list of predictions.
+    weights = [coef.astype(np.float64) for coef in model.coefs_]
+    biases = [intercept.astype(np.float64) for intercept in model.intercepts_]
+
+    # ((x - mean) / scale) @ W + b == x @ (W / scale) + (b - (mean / scale) @ W)
+    # Folded in float64 so the large feature means do not lose precision
+    biases[0] = biases[0] - (scaler.mean_ / scaler.scale_) @ weights[0]
+    weights[0] = weights[0] / scaler.scale_[:, np.newaxis]
+    return (
+        [weight.astype(np.float32) for weight in weights],
+        [bias.astype(np.float32) for bias in biases],
+    )
+
+
+def save_model_weights(model, scaler, weights_path):
+    """Save the fused model weights as a plain numpy archive for inference."""
+    weights, biases = fuse_model_and_scaler(model, scaler)
+    np.savez(
+        weights_path,
+        **{f"weight_{i}": weight for i, weight in enumerate(weights)},
+        **{f"bias_{i}": bias for i, bias in enumerate(biases)},
+    )
+
+
+def load_model_weights(weights_path, model_path, scaler_path):
+    """Load the fused model weights used by predict_power.
+
+    Models trained before the weights were exported are converted from the
+    pickled model and scaler once. The archive is only read again after it
+    was rewritten by training.
+    """
+    if not weights_path.exists():
+        model, scaler = load_model_and_scaler(model_path, scaler_path)
+        save_model_weights(model, scaler, weights_path)
+
+    mtime = weights_path.stat().st_mtime_ns
+    cached = _weights_cache.get(weights_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1], cached[2]
+
+    with np.load(weights_path) as archive:
+        layers = len(archive.files) // 2
+        weights = [archive[f"weight_{i}"] for i in range(layers)]
+        biases = [archive[f"bias_{i}"] for i in range(layers)]
+    _weights_cache[weights_path] = (mtime, weights, biases)
+    return weights, biases
+
+
+def _mlp_forward(X, weights, biases):
+    """Forward pass of a ReLU MLP regressor with identity output.
+
+    Bias and activation are applied in place so each layer allocates only
+    the output of its matmul.
     """
+    hidden = X
+    for W, b in zip(weights[:-1], biases[:-1]):
+        hidden = hidden @ W
+        hidden += b
+        np.maximum(hidden, 0, out=hidden)
+    output = hidden @ weights[-1]
+    output += biases[-1]
+    return output.ravel()
 
-    df = pd.DataFrame(forecast_data)
+
+def predict_power(weights, biases, forecast_data: pd.DataFrame) -> np.ndarray:
+    """
+    Given the fused model weights and a DataFrame with meteo features, predict
+    panel power.
+    Returns an array of predictions, one per row.
+    """
     for col in feature_cols:
-        if col not in df.columns:
+        if col not in forecast_data.columns:
             raise ValueError(f"Forecast data missing column {col}")
-    X = df[feature_cols].values
-    X_scaled = scaler.transform(X)
-    predictions = model.predict(X_scaled)
-    return predictions
+    X = forecast_data[feature_cols].to_numpy(dtype=np.float32)
+    return _mlp_forward(X, weights, biases)
@@ -1,9 +1,8 @@
-from collections.abc import Callable
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
 from typing import Any, Optional
-from zoneinfo import ZoneInfo
 
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
@@ -23,6 +22,7 @@ _LOGGER = logging.getLogger(__name__)
 
 PREDICT_DAYS_FORWARD = 7
 PREDICT_DAYS_BACK = 0
+TRAINING_DAYS_BACK = 60
 
 
 @dataclass
@@ -52,7 +52,7 @@ class PredictionTask:
     name: str
     update_interval: timedelta
     forecast_key: str
-    predict_callable: Callable[..., ForecastData]
+    predict_callable: Callable[[datetime], Awaitable[ForecastData]]
     last_run: Optional[datetime] = None
 
     def needs_update(self, now: datetime) -> bool:
@@ -81,6 +81,11 @@ def _get_prediction_window(
     return prediction_from, prediction_to
 
 
+def _get_training_window(now: datetime) -> tuple[datetime, datetime]:
+    """Calculate training window, ending before the current incomplete hour."""
+    return now - timedelta(days=TRAINING_DAYS_BACK), now - timedelta(hours=1)
+
+
 class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
     """Coordinator to run periodic prediction and training tasks sequentially."""
 
@@ -124,12 +129,10 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
                 name="Solar prediction",
                 update_interval=timedelta(minutes=15),
                 forecast_key=const.FORECAST_DATA_PV_POWER,
-                predict_callable=lambda: forecast_calc_solar.collect_and_predict(
+                predict_callable=lambda now: forecast_calc_solar.collect_and_predict(
                     self.hass,
                     *_get_prediction_window(
-                        datetime.now(ZoneInfo(self.config.timezone)),
-                        PREDICT_DAYS_BACK,
-                        PREDICT_DAYS_FORWARD,
+                        now, PREDICT_DAYS_BACK, PREDICT_DAYS_FORWARD
                     ),
                 ),
             ),
@@ -137,12 +140,10 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
                 name="Consumption prediction",
                 update_interval=timedelta(minutes=15),
                 forecast_key=const.FORECAST_DATA_POWER_CONSUMPTION,
-                predict_callable=lambda: forecast_calc_consumption.generate_predictions(
+                predict_callable=lambda now: forecast_calc_consumption.generate_predictions(
                     self.hass,
                     *_get_prediction_window(
-                        datetime.now(ZoneInfo(self.config.timezone)),
-                        PREDICT_DAYS_BACK,
-                        PREDICT_DAYS_FORWARD,
+                        now, PREDICT_DAYS_BACK, PREDICT_DAYS_FORWARD
                     ),
                 ),
             ),
@@ -150,9 +151,10 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
                 name="Battery prediction",
                 update_interval=timedelta(minutes=1),
                 forecast_key=const.FORECAST_DATA_BATTERY,
-                predict_callable=lambda: self.hass.async_add_executor_job(
+                predict_callable=lambda now: self.hass.async_add_executor_job(
                     forecast_calc_battery.forecast_battery_capacity,
                     self.hass,
+                    now,
                     PREDICT_DAYS_FORWARD,
                     self.forecasts.get(const.FORECAST_DATA_PV_POWER),
                     self.forecasts.get(const.FORECAST_DATA_POWER_CONSUMPTION),
@@ -162,9 +164,10 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
                 name="Grid prediction",
                 update_interval=timedelta(minutes=1),
                 forecast_key=const.FORECAST_DATA_GRID,
-                predict_callable=lambda: self.hass.async_add_executor_job(
+                predict_callable=lambda now: self.hass.async_add_executor_job(
                     forecast_calc_grid.forecast_grid,
                     self.hass,
+                    now,
                     PREDICT_DAYS_FORWARD,
                     self.forecasts.get(const.FORECAST_DATA_PV_POWER),
                     self.forecasts.get(const.FORECAST_DATA_POWER_CONSUMPTION),
@@ -175,16 +178,14 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
 
     async def _async_update_data(self):
         """Run training and prediction tasks sequentially."""
-        now = datetime.now(ZoneInfo(self.config.timezone))
+        now = datetime.now(self.config.tzinfo)
         executed_forecasts: dict[str, ForecastData] = {}
 
         # Execute training tasks
         for task in self.training_tasks:
             if task.needs_training(now):
                 try:
-                    training_start = now - timedelta(days=60)
-                    training_end = now - timedelta(hours=1)
-                    await task.train_callable(self.hass, training_start, training_end)
+                    await task.train_callable(self.hass, *_get_training_window(now))
                     _LOGGER.info("%s completed successfully", task.name)
                 except Exception as e:
                     _LOGGER.error("Error during %s: %s", task.name, e)
@@ -193,7 +194,7 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
         for task in self.prediction_tasks:
             if task.needs_update(now):
                 try:
-                    forecast_data: ForecastData = await task.predict_callable()
+                    forecast_data: ForecastData = await task.predict_callable(now)
 
                     self.forecasts[task.forecast_key] = forecast_data
                     executed_forecasts[task.forecast_key] = forecast_data
@@ -209,4 +210,9 @@ class ForecastCoordinator(DataUpdateCoordinator[dict[str, ForecastData]]):
                         raise ConfigEntryNotReady from e
                     _LOGGER.error("Error during %s: %s", task.name, e)
 
+        # Reduce each new forecast once, sensors only read the results
+        for forecast_data in executed_forecasts.values():
+            if forecast_data is not None:
+                forecast_data.aggregates = forecast_data.compute_aggregates(now)
+
         return executed_forecasts
@@ -1,70 +1,155 @@
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
-from typing import Any, List, Literal, Optional, TypeVar, Union
-from zoneinfo import ZoneInfo
+from datetime import UTC, datetime, time, timedelta
+from functools import cached_property
+from typing import Any, Literal, Optional, TypeVar
+
+import numpy as np
 
 from . import config
 
 T = TypeVar("T", bound=int | float)
 
 
-@dataclass
-class ForecastData:
-    """Type for storing forecast data with prediction timestamp."""
+def to_datetime64(times: Iterable[datetime]) -> np.ndarray:
+    """Convert timezone-aware datetimes to an array of naive UTC datetime64."""
+    return np.array(
+        [t.astimezone(UTC).replace(tzinfo=None) for t in times],
+        dtype="datetime64[ns]",
+    )
 
-    forecast: list[dict[str, Any]]
-    updated_at: datetime
-    value_field_min: str
-    value_field_med: str
-    value_field_max: str
 
-    def get_forecast_records_for_rest_of_today(self):
-        now = datetime.now(ZoneInfo(config.Configuration.get_instance().timezone))
-        today = now.date()
+def lookup_at(
+    times: np.ndarray, values: np.ndarray, at: np.ndarray, default: float = 0.0
+) -> np.ndarray:
+    """Return values whose timestamps exactly match `at`, `default` elsewhere.
 
-        return (
-            point[self.value_field_med]
-            for point in self.forecast
-            if (point_time := datetime.fromisoformat(point["time"])) > now
-            and point_time.date() == today
-        )
+    `times` must be sorted ascending.
+    """
+    if len(times) == 0:
+        return np.full(len(at), default, dtype=float)
+    idx = np.minimum(np.searchsorted(times, at), len(times) - 1)
+    return np.where(times[idx] == at, values[idx], default)
 
-    def get_forecast_records_for_today(self):
-        now = datetime.now(ZoneInfo(config.Configuration.get_instance().timezone))
-        today = now.date()
 
-        return (
-            point[self.value_field_med]
-            for point in self.forecast
-            if datetime.fromisoformat(point["time"]).date() == today
-        )
+def interval_mean(
+    times: np.ndarray,
+    values: np.ndarray,
+    starts: np.ndarray,
+    width: np.timedelta64 = np.timedelta64(1, "h"),
+) -> np.ndarray:
+    """Average values whose timestamps fall in [start, start + width) for each
+    of `starts`, 0 for intervals without any value.
 
-    def get_nearest_forecast_record(self):
-        now = datetime.now(ZoneInfo(config.Configuration.get_instance().timezone))
+    `times` must be sorted ascending. The intervals follow the given starts, so
+    hours stay aligned to local time in zones with non-whole-hour offsets.
+    """
+    lo = np.searchsorted(times, starts, side="left")
+    hi = np.searchsorted(times, starts + width, side="left")
+    cumsum = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    counts = hi - lo
+    return np.where(counts > 0, (cumsum[hi] - cumsum[lo]) / np.maximum(counts, 1), 0.0)
+
+
+@dataclass
+class ForecastAggregates:
+    """Sums and current value of the median forecast, shared by all sensors."""
+
+    nearest: Optional[float]
+    today: float
+    rest_of_today: float
+
+
+@dataclass
+class ForecastData:
+    """Type for storing forecast data with prediction timestamp.
 
-        last_past_point = None
-        for point in self.forecast:
-            point_time = datetime.fromisoformat(point["time"])
-            if point_time > now:
-                break
-            last_past_point = point
+    The forecast is stored column-wise: `forecast["time"]` holds sorted UTC
+    datetime64 timestamps and each value field holds an array of the same length.
+    """
 
-        return last_past_point[self.value_field_med] if last_past_point else None
+    forecast: dict[str, np.ndarray]
+    updated_at: datetime
+    value_field_min: Optional[str]
+    value_field_med: str
+    value_field_max: Optional[str]
+    aggregates: Optional[ForecastAggregates] = None
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.forecast["time"]
+
+    @cached_property
+    def iso_times(self) -> list[str]:
+        """Forecast times as local ISO 8601 strings, formatted once per forecast."""
+        tz = config.Configuration.get_instance().tzinfo
+        return [
+            t.replace(tzinfo=UTC).astimezone(tz).isoformat()
+            for t in self.times.astype("datetime64[us]").tolist()
+        ]
+
+    @cached_property
+    def forecast_attributes(self) -> dict[str, Any]:
+        """Sensor attributes with the full forecast, shared by all sensors."""
+        return {"forecast": self.get_forecast_records()}
+
+    def _value_fields(self) -> list[str]:
+        return [
+            field
+            for field in (
+                self.value_field_min,
+                self.value_field_med,
+                self.value_field_max,
+            )
+            if field is not None and field in self.forecast
+        ]
+
+    def get_forecast_records(self) -> list[dict[str, Any]]:
+        """Return the forecast as a list of records with ISO formatted time."""
+        columns = {
+            field: self.forecast[field].tolist() for field in self._value_fields()
+        }
+        return [
+            {
+                "time": iso_time,
+                **{field: values[i] for field, values in columns.items()},
+            }
+            for i, iso_time in enumerate(self.iso_times)
+        ]
+
+    def compute_aggregates(self, now: datetime) -> ForecastAggregates:
+        """Compute the values reported by sensors as of `now`.
+
+        Times are sorted, so the nearest value is the last point at or before
+        `now`, today is the slice [start of day, end of day) and the rest of
+        today is the slice (now, end of day).
+        """
+        start_of_today = datetime.combine(now.date(), time(0, 0), tzinfo=now.tzinfo)
+        end_of_today = start_of_today + timedelta(days=1)
+        start, current, end = to_datetime64([start_of_today, now, end_of_today])
+
+        values = self.forecast[self.value_field_med]
+        lo, hi = np.searchsorted(self.times, [start, end], side="left")
+        idx = np.searchsorted(self.times, current, side="right")
+        return ForecastAggregates(
+            nearest=float(values[idx - 1]) if idx else None,
+            today=float(values[lo:hi].sum()),
+            rest_of_today=float(values[idx:hi].sum()),
+        )
 
     def aggregate_by_interval(
         self,
         aggregation_fn: Literal["sum", "average"],
-        post_process_fn: Optional[Callable[[float], float]] = None,
+        post_process_fn: Optional[Callable[[np.ndarray], np.ndarray]] = None,
         interval: timedelta = timedelta(days=1),
     ) -> list[dict]:
         """Aggregate forecast data by interval for all value fields.
 
         Args:
             aggregation_fn: The aggregation function to use ("sum" or "average")
-            post_process_fn: Optional function to process the aggregated value
+            post_process_fn: Optional function applied to the array of aggregated
+                values of each field
             interval: Time interval for aggregation (default: 1 day)
-            timezone: Timezone for aggregation (default: UTC)
 
         Returns:
             List of dictionaries containing aggregated values
@@ -75,100 +160,46 @@ class ForecastData:
         if aggregation_fn not in ["sum", "average"]:
             raise ValueError('aggregation_fn must be either "sum" or "average"')
 
-        if not self.forecast:
+        times = self.times
+        if len(times) == 0:
             return []
 
-        tz = ZoneInfo(config.Configuration.get_instance().timezone)
-        result = []
+        tz = config.Configuration.get_instance().tzinfo
 
-        # Group data points by interval
-        current_interval = {}
-        interval_start = None
-        points_in_interval = 0
-
-        for point in self.forecast:
-            point_time = datetime.fromisoformat(point["time"])
-            if interval_start is None:
-                interval_start = point_time
-
-            # Check if we're still in the current interval
-            if point_time - interval_start < interval:
-                for field in [
-                    self.value_field_min,
-                    self.value_field_med,
-                    self.value_field_max,
-                ]:
-                    if field is not None and field in point:  # Add null check
-                        current_interval.setdefault(field, 0.0)
-                        current_interval[field] += point[field]
-                points_in_interval += 1
-            else:
-                # Process the completed interval
-                interval_mid = interval_start + interval / 2
-                interval_mid = datetime.combine(
-                    interval_mid.date(), time(12, 0), tzinfo=tz
+        # Each interval starts at the first point not covered by the previous one
+        starts = []
+        start = 0
+        while start < len(times):
+            starts.append(start)
+            start = int(
+                np.searchsorted(
+                    times, times[start] + np.timedelta64(interval), side="left"
                 )
+            )
+        starts = np.array(starts)
+        counts = np.diff(np.append(starts, len(times)))
+
+        aggregated_fields = {}
+        for field in self._value_fields():
+            values = np.add.reduceat(self.forecast[field], starts)
+            if aggregation_fn == "average":
+                values = values / counts
+            if post_process_fn:
+                values = post_process_fn(values)
+            aggregated_fields[field] = values.tolist()
 
-                aggregated = {"time": interval_mid.isoformat()}
-
-                # Calculate aggregated values for each field
-                for field in [
-                    self.value_field_min,
-                    self.value_field_med,
-                    self.value_field_max,
-                ]:
-                    if (
-                        field is not None and field in current_interval
-                    ):  # Add null check
-                        value = current_interval[field]
-                        if aggregation_fn == "average":
-                            value = value / points_in_interval
-                        elif aggregation_fn == "sum":
-                            value = value
-
-                        if post_process_fn:
-                            value = post_process_fn(value)
-
-                        aggregated[field] = value
-
-                result.append(aggregated)
-
-                # Start new interval
-                interval_start = point_time
-                current_interval = {
-                    field: point[field]
-                    for field in [
-                        self.value_field_min,
-                        self.value_field_med,
-                        self.value_field_max,
-                    ]
-                    if field is not None and field in point  # Add null check
-                }
-                points_in_interval = 1
-
-        # Process the last interval if it contains data
-        if current_interval and points_in_interval > 0:
-            interval_mid = interval_start + interval / 2
+        result = []
+        for i, interval_start in enumerate(
+            times[starts].astype("datetime64[us]").tolist()
+        ):
+            interval_mid = (
+                interval_start.replace(tzinfo=UTC).astimezone(tz) + interval / 2
+            )
             interval_mid = datetime.combine(interval_mid.date(), time(12, 0), tzinfo=tz)
 
             aggregated = {"time": interval_mid.isoformat()}
-
-            for field in [
-                self.value_field_min,
-                self.value_field_med,
-                self.value_field_max,
-            ]:
-                if field is not None and field in current_interval:  # Add null check
-                    value = current_interval[field]
-                    if aggregation_fn == "average":
-                        value = value / points_in_interval
-                    elif aggregation_fn == "sum":
-                        value = value
-
-                    if post_process_fn:
-                        value = post_process_fn(value)
-
-                    aggregated[field] = value
+            for field, values in aggregated_fields.items():
+                aggregated[field] = values[i]
 
             result.append(aggregated)
 
@@ -12,6 +12,9 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class ForecastSensorBase(CoordinatorEntity[ForecastCoordinator], SensorEntity, ABC):
+    # The forecast is replaced on every prediction, keep it out of the recorder
+    _unrecorded_attributes = frozenset({"forecast"})
+
     def __init__(
         self,
         coordinator: ForecastCoordinator,
@@ -23,6 +26,8 @@ class ForecastSensorBase(CoordinatorEntity[ForecastCoordinator], SensorEntity, A
         self._attributes = {}
         self._name = name
         self._id = id
+        # Constant per sensor class, resolved once instead of on every update
+        self._forecast_data_key = self._get_forecast_data_key()
 
     @property
     def state(self):
@@ -55,8 +60,8 @@ class ForecastSensorBase(CoordinatorEntity[ForecastCoordinator], SensorEntity, A
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._handle_update()
-        super()._handle_coordinator_update()
+        if self._handle_update():
+            super()._handle_coordinator_update()
 
     async def async_added_to_hass(self):
         """Restore state when the entity is added to hass."""
@@ -66,14 +71,20 @@ class ForecastSensorBase(CoordinatorEntity[ForecastCoordinator], SensorEntity, A
     def _get_forecast(self, forecast_data_key: str):
         return self.coordinator.data[forecast_data_key]
 
-    def _handle_update(self):
-        forecast_data_key = self._get_forecast_data_key()
-        forecasts = self.coordinator.data
-        if forecast_data_key in forecasts:
-            forecast_data = forecasts[forecast_data_key]
-            self._state, self._attributes = self._get_state_and_attr_from_forecast(
-                forecast_data
-            )
+    def _handle_update(self) -> bool:
+        """Update state and attributes, return True if any of them changed."""
+        forecast_data = self.coordinator.data.get(self._forecast_data_key)
+        if forecast_data is None:
+            return False
+
+        state, attributes = self._get_state_and_attr_from_forecast(forecast_data)
+        if state == self._state and (
+            attributes is self._attributes or attributes == self._attributes
+        ):
+            return False
+
+        self._state, self._attributes = state, attributes
+        return True
 
     @abstractmethod
     def _get_forecast_data_key(self) -> str:
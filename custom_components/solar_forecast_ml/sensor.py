@@ -11,6 +11,14 @@ from .forecast_sensor_base import ForecastSensorBase
 
 _LOGGER = logging.getLogger(__name__)
 
+# Shared by sensors without attributes, never mutated
+_EMPTY_ATTRIBUTES: dict = {}
+
+
+def _round_or_none(value: float | None) -> int | None:
+    """Round a forecast value, None if the forecast has no point up to now."""
+    return None if value is None else round(value)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -67,9 +75,10 @@ class ForecastSensorSolarPower(ForecastSensorBase):
         return const.FORECAST_DATA_PV_POWER
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(forecast_data.get_nearest_forecast_record()), {
-            "forecast": forecast_data.forecast
-        }
+        return (
+            _round_or_none(forecast_data.aggregates.nearest),
+            forecast_data.forecast_attributes,
+        )
 
     @property
     def unit_of_measurement(self):
@@ -81,9 +90,10 @@ class ForecastSensorPowerConsumption(ForecastSensorBase):
         return const.FORECAST_DATA_POWER_CONSUMPTION
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(forecast_data.get_nearest_forecast_record()), {
-            "forecast": forecast_data.forecast
-        }
+        return (
+            _round_or_none(forecast_data.aggregates.nearest),
+            forecast_data.forecast_attributes,
+        )
 
     @property
     def unit_of_measurement(self):
@@ -95,9 +105,10 @@ class ForecastSensorBattery(ForecastSensorBase):
         return const.FORECAST_DATA_BATTERY
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(forecast_data.get_nearest_forecast_record()), {
-            "forecast": forecast_data.forecast,
-        }
+        return (
+            _round_or_none(forecast_data.aggregates.nearest),
+            forecast_data.forecast_attributes,
+        )
 
     @property
     def unit_of_measurement(self):
@@ -109,9 +120,10 @@ class ForecastSensorGridPower(ForecastSensorBase):
         return const.FORECAST_DATA_GRID
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(forecast_data.get_nearest_forecast_record()), {
-            "forecast": forecast_data.forecast
-        }
+        return (
+            _round_or_none(forecast_data.aggregates.nearest),
+            forecast_data.forecast_attributes,
+        )
 
     @property
     def unit_of_measurement(self):
@@ -123,7 +135,7 @@ class ForecastSensorSolarEnergyToday(ForecastSensorBase):
         return const.FORECAST_DATA_PV_POWER
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(sum(forecast_data.get_forecast_records_for_today()) / 4), {
+        return round(forecast_data.aggregates.today / 4), {
             "forecast": forecast_data.aggregate_by_interval("sum", lambda x: x / 4)
         }
 
@@ -137,9 +149,7 @@ class ForecastSensorSolarEnergyRestOfToday(ForecastSensorBase):
         return const.FORECAST_DATA_PV_POWER
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(
-            sum(forecast_data.get_forecast_records_for_rest_of_today()) / 4
-        ), {}
+        return round(forecast_data.aggregates.rest_of_today / 4), _EMPTY_ATTRIBUTES
 
     @property
     def unit_of_measurement(self):
@@ -151,7 +161,7 @@ class ForecastSensorGridEnergyRestOfToday(ForecastSensorBase):
         return const.FORECAST_DATA_GRID
 
     def _get_state_and_attr_from_forecast(self, forecast_data: ForecastData):
-        return round(sum(forecast_data.get_forecast_records_for_rest_of_today())), {}
+        return round(forecast_data.aggregates.rest_of_today), _EMPTY_ATTRIBUTES
 
     @property
     def unit_of_measurement(self):